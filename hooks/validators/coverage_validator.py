@@ -12,132 +12,328 @@ Environment variables:
   COVERAGE_THRESHOLD: Minimum coverage percentage (default: 80)
 """
 
+import hashlib
 import json
 import os
 import re
 import subprocess
+import time
 from pathlib import Path
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 DEFAULT_THRESHOLD = 80
 
+CACHE_FILE = Path.home() / ".claude" / "data" / "coverage_cache.json"
+
+# Directories that never contain source files worth fingerprinting
+SKIP_DIRS = {"node_modules", "dist", ".next", "coverage"}
+
+SOURCE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx")
+
+# Union of the common coverage summary formats, compiled once:
+# Vitest/Jest table, Istanbul Statements/Lines, simple/generic, Total row
+_COVERAGE_RE = re.compile(
+    r"All files\s*\|\s*([\d.]+)\s*\|"
+    r"|Statements\s*:\s*([\d.]+)%"
+    r"|Lines\s*:\s*([\d.]+)%"
+    r"|Coverage:\s*([\d.]+)%"
+    r"|([\d.]+)%\s*coverage"
+    r"|Total.*?([\d.]+)%",
+    re.IGNORECASE,
+)
+
+# Coverage summaries are printed at the tail of the run; only scan that much
+_PARSE_TAIL_BYTES = 32768
+
+
+ROOT_CACHE_FILE = Path.home() / ".claude" / "data" / "last_project_root"
+
+
+def _cached_project_root(key: str) -> Path | None:
+    """Look up a previously resolved project root, revalidating it."""
+    try:
+        cache = json.loads(ROOT_CACHE_FILE.read_text())
+        root = cache.get(key)
+    except (IOError, ValueError):
+        return None
+
+    if root and (Path(root) / "package.json").exists():
+        return Path(root)
+    return None
+
+
+def _remember_project_root(key: str, root: Path) -> None:
+    """Persist a resolved root for later hook invocations.
+
+    Each hook runs in a fresh process, so the disk cache is the only
+    channel that survives; CLAUDE_PROJECT_ROOT is read as an externally
+    set hint but never written here.
+    """
+    try:
+        try:
+            cache = json.loads(ROOT_CACHE_FILE.read_text())
+        except (IOError, ValueError):
+            cache = {}
+        cache[key] = str(root)
+        ROOT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        ROOT_CACHE_FILE.write_text(json.dumps(cache))
+    except IOError:
+        pass
+
 
 def find_project_root() -> Path | None:
-    """Find the project root by looking for package.json."""
+    """Find the project root by looking for package.json.
+
+    Checks the CLAUDE_PROJECT_ROOT hint and the on-disk cache before
+    walking parents, so repeated hook fires skip the per-directory stats.
+    """
     cwd = Path.cwd()
 
+    hint = os.environ.get("CLAUDE_PROJECT_ROOT")
+    if hint and (Path(hint) / "package.json").exists():
+        return Path(hint)
+
+    cached = _cached_project_root(str(cwd))
+    if cached:
+        return cached
+
     for parent in [cwd] + list(cwd.parents):
         if (parent / "package.json").exists():
+            _remember_project_root(str(cwd), parent)
             return parent
 
     return cwd
 
 
-def run_coverage(project_root: Path) -> tuple[bool, str, float | None]:
-    """Run coverage and return (success, output, coverage_percentage)."""
-    # Try different coverage commands
-    coverage_commands = [
-        ["pnpm", "test:coverage"],
-        ["pnpm", "run", "test:coverage"],
-        ["npm", "run", "test:coverage"],
-        ["pnpm", "vitest", "run", "--coverage"],
-        ["npx", "vitest", "run", "--coverage"],
-    ]
-
-    for cmd in coverage_commands:
+def compute_fingerprint(project_root: Path) -> tuple[str, int] | None:
+    """Hash (path, mtime, size) of all source files under src/ into a digest.
+
+    Returns (digest, newest mtime_ns seen), or None if there is no src/
+    directory to fingerprint.
+    """
+    src_dir = project_root / "src"
+    if not src_dir.is_dir():
+        return None
+
+    digest = hashlib.blake2b(digest_size=16)
+    max_mtime_ns = 0
+
+    def walk(dir_path: str) -> None:
+        nonlocal max_mtime_ns
+        try:
+            entries = sorted(os.scandir(dir_path), key=lambda e: e.name)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    walk(entry.path)
+            elif entry.name.endswith(SOURCE_EXTENSIONS):
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.st_mtime_ns > max_mtime_ns:
+                    max_mtime_ns = stat.st_mtime_ns
+                digest.update(f"{entry.path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+
+    walk(str(src_dir))
+    return digest.hexdigest(), max_mtime_ns
+
+
+def any_source_newer(project_root: Path, max_mtime_ns: int) -> bool:
+    """Walk src/ and bail out at the first file newer than the cached mtime.
+
+    Much cheaper than the full fingerprint on the common "something
+    changed" path, and equally cheap when nothing did - either way each
+    file is stat'ed at most once and no hashing happens.
+    """
+    src_dir = project_root / "src"
+    if not src_dir.is_dir():
+        return True
+
+    def walk(dir_path: str) -> bool:
+        try:
+            entries = os.scandir(dir_path)
+        except OSError:
+            return False
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS and walk(entry.path):
+                    return True
+            elif entry.name.endswith(SOURCE_EXTENSIONS):
+                try:
+                    if entry.stat(follow_symlinks=False).st_mtime_ns > max_mtime_ns:
+                        return True
+                except OSError:
+                    continue
+        return False
+
+    return walk(str(src_dir))
+
+
+def load_cache() -> dict:
+    """Load the cached coverage result from the last run."""
+    if CACHE_FILE.exists():
         try:
-            result = subprocess.run(
-                cmd,
-                cwd=project_root,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
+            return json.loads(CACHE_FILE.read_text())
+        except (json.JSONDecodeError, IOError):
+            return {}
+    return {}
+
+
+def save_cache(project_root: Path, fingerprint: str, coverage: float, max_mtime_ns: int) -> None:
+    """Persist the coverage result keyed by the source fingerprint."""
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_FILE.write_text(json.dumps({
+            "project_root": str(project_root),
+            "fingerprint": fingerprint,
+            "coverage": coverage,
+            "max_mtime_ns": max_mtime_ns,
+            "ts": time.time(),
+        }))
+    except IOError:
+        pass
 
-            output = result.stdout + result.stderr
 
-            # Check if command was found and ran
-            if "not found" in output.lower() or "missing script" in output.lower():
-                continue
+def resolve_coverage_command(project_root: Path, pkg: dict) -> list[str]:
+    """Pick the single coverage command to run, based on package.json.
 
-            # Parse coverage from output
-            coverage = parse_coverage(output)
+    Resolves the package manager from the lockfile and bypasses the
+    `npm run` wrapper when the script is a plain vitest invocation, so we
+    pay exactly one Node startup instead of probing commands in sequence.
+    """
+    use_pnpm = (project_root / "pnpm-lock.yaml").exists()
+    exec_cmd = ["pnpm", "exec"] if use_pnpm else ["npx"]
 
-            if coverage is not None:
-                return result.returncode == 0, output, coverage
+    script = pkg.get("scripts", {}).get("test:coverage", "")
+    if script:
+        if script.startswith("vitest"):
+            return exec_cmd + script.split()
+        run_cmd = ["pnpm", "run"] if use_pnpm else ["npm", "run"]
+        return run_cmd + ["test:coverage"]
 
-            # If tests passed but no coverage found, check for coverage files
-            if result.returncode == 0:
-                coverage = read_coverage_file(project_root)
-                if coverage is not None:
-                    return True, output, coverage
+    return exec_cmd + ["vitest", "run", "--coverage"]
 
-            return result.returncode == 0, output, None
 
-        except subprocess.TimeoutExpired:
-            return False, "Coverage check timed out", None
-        except FileNotFoundError:
-            continue
-        except Exception:
-            continue
+def run_coverage(project_root: Path, pkg: dict) -> tuple[bool, str, float | None]:
+    """Run coverage and return (success, output, coverage_percentage)."""
+    cmd = resolve_coverage_command(project_root, pkg)
+
+    try:
+        result = subprocess.run(
+            cmd,
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            timeout=120
+        )
+
+        output = result.stdout + result.stderr
+
+        # Check if command was found and ran
+        if "not found" in output.lower() or "missing script" in output.lower():
+            return False, "No coverage command found", None
+
+        # Parse coverage from output
+        coverage = parse_coverage(output)
+
+        if coverage is not None:
+            return result.returncode == 0, output, coverage
+
+        # If tests passed but no coverage found, check for coverage files
+        if result.returncode == 0:
+            coverage = read_coverage_file(project_root)
+            if coverage is not None:
+                return True, output, coverage
+
+        return result.returncode == 0, output, None
 
-    return False, "No coverage command found", None
+    except subprocess.TimeoutExpired:
+        return False, "Coverage check timed out", None
+    except FileNotFoundError:
+        return False, "No coverage command found", None
+    except Exception:
+        return False, "No coverage command found", None
 
 
 def parse_coverage(output: str) -> float | None:
     """Parse coverage percentage from command output."""
-    # Look for common coverage output patterns
-    patterns = [
-        r"All files\s*\|\s*([\d.]+)\s*\|",  # Vitest/Jest table format
-        r"Statements\s*:\s*([\d.]+)%",        # Istanbul format
-        r"Lines\s*:\s*([\d.]+)%",             # Alternative Istanbul
-        r"Coverage:\s*([\d.]+)%",             # Simple format
-        r"([\d.]+)%\s*coverage",              # Generic
-        r"Total.*?([\d.]+)%",                 # Total row
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, output, re.IGNORECASE)
-        if match:
-            try:
-                return float(match.group(1))
-            except ValueError:
-                continue
+    match = _COVERAGE_RE.search(output[-_PARSE_TAIL_BYTES:])
+    if match:
+        try:
+            return float(next(g for g in match.groups() if g))
+        except (ValueError, StopIteration):
+            return None
 
     return None
 
 
 def read_coverage_file(project_root: Path) -> float | None:
-    """Try to read coverage from coverage files."""
-    coverage_paths = [
-        project_root / "coverage" / "coverage-summary.json",
-        project_root / "coverage" / "coverage-final.json",
-    ]
-
-    for coverage_path in coverage_paths:
-        if coverage_path.exists():
-            try:
-                data = json.loads(coverage_path.read_text())
-
-                # coverage-summary.json format
-                if "total" in data and "lines" in data["total"]:
-                    return data["total"]["lines"].get("pct", 0)
-
-                # Try to compute from coverage-final.json
-                if isinstance(data, dict) and len(data) > 0:
-                    total_lines = 0
-                    covered_lines = 0
-                    for file_data in data.values():
-                        if "s" in file_data:  # Statement coverage
-                            statements = file_data["s"]
-                            total_lines += len(statements)
-                            covered_lines += sum(1 for v in statements.values() if v > 0)
-
-                    if total_lines > 0:
-                        return (covered_lines / total_lines) * 100
-
-            except (json.JSONDecodeError, KeyError, TypeError):
-                continue
+    """Try to read coverage from coverage files.
+
+    coverage-summary.json already holds the total under total.lines.pct and
+    is a few KB; coverage-final.json is per-file instrumentation data that
+    can run to tens of MB, so it is only touched when the summary is missing.
+    """
+    summary_path = project_root / "coverage" / "coverage-summary.json"
+    if summary_path.exists():
+        try:
+            data = json.loads(summary_path.read_text())
+            if "total" in data and "lines" in data["total"]:
+                return data["total"]["lines"].get("pct", 0)
+        except (json.JSONDecodeError, KeyError, TypeError, IOError):
+            pass
+
+    final_path = project_root / "coverage" / "coverage-final.json"
+    if final_path.exists():
+        try:
+            return _compute_coverage_from_final(final_path)
+        except (json.JSONDecodeError, KeyError, TypeError, IOError):
+            pass
+
+    return None
+
+
+def _compute_coverage_from_final(final_path: Path) -> float | None:
+    """Compute line coverage from coverage-final.json statement counts.
+
+    Streams with ijson when available so the multi-MB file is never held in
+    memory at once; otherwise parses from a binary file handle.
+    """
+    total_lines = 0
+    covered_lines = 0
+
+    try:
+        import ijson
+
+        with open(final_path, "rb") as f:
+            for _, file_data in ijson.kvitems(f, ""):
+                statements = file_data.get("s") if isinstance(file_data, dict) else None
+                if statements:
+                    total_lines += len(statements)
+                    covered_lines += sum(1 for v in statements.values() if v > 0)
+    except ImportError:
+        with open(final_path, "rb") as f:
+            data = json.load(f)
+
+        if not isinstance(data, dict):
+            return None
+
+        for file_data in data.values():
+            if "s" in file_data:  # Statement coverage
+                statements = file_data["s"]
+                total_lines += len(statements)
+                covered_lines += sum(1 for v in statements.values() if v > 0)
+
+    if total_lines > 0:
+        return (covered_lines / total_lines) * 100
 
     return None
 
@@ -153,21 +349,53 @@ def main():
         return
 
     # Check if this is a project with tests
+    pkg = {}
     package_json = project_root / "package.json"
     if package_json.exists():
         try:
-            pkg = json.loads(package_json.read_text())
+            pkg = json_loads(package_json.read_bytes())
             scripts = pkg.get("scripts", {})
             has_test = any("test" in k for k in scripts.keys())
             if not has_test:
                 # No test scripts, allow completion
                 print(json.dumps({"decision": "allow"}))
                 return
-        except (json.JSONDecodeError, IOError):
-            pass
+        except (ValueError, IOError):
+            pkg = {}
+
+    # Skip the coverage run entirely if no source file changed since a passing
+    # run. The mtime sentinel is the cheap check (no hashing, early exit on
+    # the first fresh file); the fingerprint comparison backs it up
+    # A result cached for another project proves nothing about this one
+    cache = load_cache()
+    cache_valid = (
+        cache.get("project_root") == str(project_root)
+        and cache.get("coverage", 0) >= threshold
+    )
+
+    if cache_valid and cache.get("max_mtime_ns") is not None:
+        if not any_source_newer(project_root, cache["max_mtime_ns"]):
+            print(json.dumps({
+                "decision": "allow",
+                "reason": f"Coverage: {cache['coverage']:.1f}% (threshold: {threshold}%, cached)"
+            }))
+            return
+
+    fingerprinted = compute_fingerprint(project_root)
+    if fingerprinted is not None:
+        fingerprint, max_mtime_ns = fingerprinted
+        if cache_valid and cache.get("fingerprint") == fingerprint:
+            print(json.dumps({
+                "decision": "allow",
+                "reason": f"Coverage: {cache['coverage']:.1f}% (threshold: {threshold}%, cached)"
+            }))
+            return
 
     # Run coverage
-    success, output, coverage = run_coverage(project_root)
+    success, output, coverage = run_coverage(project_root, pkg)
+
+    if fingerprinted is not None and coverage is not None:
+        save_cache(project_root, fingerprint, coverage, max_mtime_ns)
 
     if coverage is None:
         # Couldn't determine coverage - allow but warn
@@ -10,69 +10,337 @@ Input: JSON on stdin with tool_input.file_path
 Output: JSON with decision (allow/block) and reason
 """
 
+import functools
+import hashlib
 import json
+import os
+import shutil
 import subprocess
 import sys
+import time
 from pathlib import Path
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
+QUEUE_DIR = Path.home() / ".claude" / "data" / "oxlint_queues"
+PENDING_FILE = Path.home() / ".claude" / "data" / "oxlint_pending.json"
+
+# How long to wait for other edits in a burst to land in the queue
+DEBOUNCE_SECONDS = 0.25
+
+# Drop a pending background lint that never finished after this long
+PENDING_MAX_AGE_SECONDS = 60
+
+# Fixed worker-process cap for sharded lints of large batches
+MAX_LINT_WORKERS = 4
+
+
+def _queue_path(project_root: Path) -> Path:
+    # Per-root queues keep a multi-project session from linting one
+    # project's files with another's cwd and oxlint binary
+    digest = hashlib.blake2b(str(project_root).encode(), digest_size=8).hexdigest()
+    return QUEUE_DIR / f"{digest}.jsonl"
+
+
+def queue_file(project_root: Path, file_path: str) -> None:
+    """Append a file to the project's pending-lint queue."""
+    try:
+        QUEUE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(_queue_path(project_root), "a") as f:
+            f.write(json.dumps({"file": file_path, "ts": time.time()}) + "\n")
+    except IOError:
+        pass
+
+
+def drain_queue(project_root: Path) -> list[str]:
+    """Atomically claim and drain the queue, returning deduped file paths.
+
+    Uses os.replace so that when several hook instances race, exactly one
+    wins the batch and the rest see an empty queue.
+    """
+    queue = _queue_path(project_root)
+    claimed = queue.with_suffix(".draining")
+    try:
+        os.replace(queue, claimed)
+    except OSError:
+        return []
+
+    files: list[str] = []
+    seen: set[str] = set()
+    try:
+        with open(claimed) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                path = entry.get("file", "")
+                if path and path not in seen:
+                    seen.add(path)
+                    files.append(path)
+    except IOError:
+        pass
+    finally:
+        try:
+            os.unlink(claimed)
+        except OSError:
+            pass
+
+    return files
+
+
+_LINTABLE_EXTENSIONS = frozenset({".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs"})
+
+# node_modules plus dist/build directories
+_SKIP_DIR_PARTS = frozenset({"node_modules", "dist", "build", ".next", "out"})
+
+
+@functools.lru_cache(maxsize=1024)
 def is_lintable_file(file_path: str) -> bool:
     """Check if a file should be linted."""
-    path = Path(file_path)
-    lintable_extensions = {".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs"}
-
-    if path.suffix not in lintable_extensions:
+    # Pure string checks - building a Path here costs more than the decision
+    if os.path.splitext(file_path)[1] not in _LINTABLE_EXTENSIONS:
         return False
 
-    # Skip node_modules
-    if "node_modules" in path.parts:
-        return False
+    parts = file_path.replace("\\", "/").split("/")
+    return not any(part in _SKIP_DIR_PARTS for part in parts)
+
+
+ROOT_CACHE_FILE = Path.home() / ".claude" / "data" / "last_project_root"
+
+
+def _cached_project_root(key: str) -> Path | None:
+    """Look up a previously resolved project root, revalidating it."""
+    try:
+        cache = json.loads(ROOT_CACHE_FILE.read_text())
+        root = cache.get(key)
+    except (IOError, ValueError):
+        return None
+
+    if root and (Path(root) / "package.json").exists():
+        return Path(root)
+    return None
 
-    # Skip dist/build directories
-    if any(d in path.parts for d in ["dist", "build", ".next", "out"]):
-        return False
 
-    return True
+def _remember_project_root(key: str, root: Path) -> None:
+    """Persist a resolved root for later hook invocations.
+
+    Each hook runs in a fresh process, so the disk cache is the only
+    channel that survives; CLAUDE_PROJECT_ROOT is read as an externally
+    set hint but never written here.
+    """
+    try:
+        try:
+            cache = json.loads(ROOT_CACHE_FILE.read_text())
+        except (IOError, ValueError):
+            cache = {}
+        cache[key] = str(root)
+        ROOT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        ROOT_CACHE_FILE.write_text(json.dumps(cache))
+    except IOError:
+        pass
 
 
 def find_project_root(file_path: str) -> Path | None:
-    """Find the project root by looking for package.json."""
+    """Find the project root by looking for package.json.
+
+    Checks the CLAUDE_PROJECT_ROOT hint and the on-disk cache before
+    walking parents, so later validators in a hook chain skip the
+    stat-per-directory walk.
+    """
     path = Path(file_path).resolve()
 
+    hint = os.environ.get("CLAUDE_PROJECT_ROOT")
+    if hint and str(path).startswith(hint) and (Path(hint) / "package.json").exists():
+        return Path(hint)
+
+    cached = _cached_project_root(str(path.parent))
+    if cached:
+        return cached
+
     for parent in [path] + list(path.parents):
         if (parent / "package.json").exists():
+            _remember_project_root(str(path.parent), parent)
             return parent
 
     return None
 
 
-def run_oxlint(file_path: str, project_root: Path) -> tuple[bool, str]:
-    """Run oxlint on the file and return (success, output)."""
+# Resolved oxlint command per project root, so the lookup runs once per process
+_oxlint_cmd_cache: dict[Path, list[str]] = {}
+
+
+def resolve_oxlint_command(project_root: Path) -> list[str]:
+    """Resolve the oxlint binary, avoiding the pnpm exec shim when possible.
+
+    oxlint is a native binary; going through pnpm just adds a Node cold
+    start in front of it. Prefer node_modules/.bin, then PATH, and only
+    fall back to pnpm exec.
+    """
+    cached = _oxlint_cmd_cache.get(project_root)
+    if cached is not None:
+        return cached
+
+    local_bin = project_root / "node_modules" / ".bin" / "oxlint"
+    if local_bin.is_file():
+        cmd = [str(local_bin)]
+    else:
+        which_bin = shutil.which("oxlint")
+        cmd = [which_bin] if which_bin else ["pnpm", "exec", "oxlint"]
+
+    _oxlint_cmd_cache[project_root] = cmd
+    return cmd
+
+
+def _partition_by_size(file_paths: list[str]) -> list[list[str]]:
+    """Split files into up to MAX_LINT_WORKERS chunks balanced by byte size.
+
+    Greedy assignment of the largest files first keeps shard wall times
+    roughly even instead of one worker drawing all the big files.
+    """
+    workers = min(MAX_LINT_WORKERS, len(file_paths))
+    if workers <= 1:
+        return [list(file_paths)]
+
+    sized = []
+    for file_path in file_paths:
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            size = 0
+        sized.append((size, file_path))
+    sized.sort(reverse=True)
+
+    chunks: list[list[str]] = [[] for _ in range(workers)]
+    loads = [0] * workers
+    for size, file_path in sized:
+        lightest = loads.index(min(loads))
+        chunks[lightest].append(file_path)
+        loads[lightest] += size
+
+    return [chunk for chunk in chunks if chunk]
+
+
+def _pending_lint_alive() -> bool:
+    """True while any shard of the recorded background lint is running."""
     try:
-        result = subprocess.run(
-            ["pnpm", "exec", "oxlint", file_path],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        # oxlint returns 0 on success, non-zero on errors
-        if result.returncode == 0:
-            return True, ""
-
-        # Combine stdout and stderr for error output
-        output = result.stdout + result.stderr
-        return False, output.strip()
-
-    except subprocess.TimeoutExpired:
-        return True, ""  # Allow on timeout
+        pending = json.loads(PENDING_FILE.read_text())
+    except (IOError, json.JSONDecodeError):
+        return False
+
+    jobs = pending.get("jobs")
+    if jobs is None:
+        jobs = [{"pid": pending.get("pid")}]
+
+    for job in jobs:
+        try:
+            os.kill(job.get("pid"), 0)
+        except (ProcessLookupError, TypeError):
+            continue
+        except PermissionError:
+            pass
+        return True
+
+    return False
+
+
+def start_background_lint(file_paths: list[str], project_root: Path) -> None:
+    """Spawn oxlint detached so the hook returns without waiting on it.
+
+    Large batches are sharded across worker processes; each shard writes
+    its output to a file, and the next hook invocation reaps the results
+    via check_pending_lint and blocks then if errors were found.
+
+    While a previous batch is still running its record must not be
+    clobbered - its errors would be lost - so the new batch goes back on
+    the queue for whichever hook fires after the pending lint is reaped.
+    """
+    if _pending_lint_alive():
+        for file_path in file_paths:
+            queue_file(project_root, file_path)
+        return
+
+    try:
+        base_cmd = resolve_oxlint_command(project_root) + ["--quiet", "--format=json"]
+        jobs = []
+        for i, chunk in enumerate(_partition_by_size(file_paths)):
+            output_file = PENDING_FILE.with_suffix(f".output.{i}")
+            with open(output_file, "wb") as out:
+                proc = subprocess.Popen(
+                    base_cmd + chunk,
+                    cwd=project_root,
+                    stdout=out,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True,
+                )
+            jobs.append({"pid": proc.pid, "output": str(output_file)})
+
+        PENDING_FILE.write_text(json.dumps({
+            "jobs": jobs,
+            "files": file_paths,
+            "ts": time.time(),
+        }))
     except FileNotFoundError:
-        # oxlint not installed - allow but warn
-        return True, ""
+        # oxlint not installed - nothing to do
+        pass
     except Exception:
-        # On unexpected errors, allow to not block workflow
-        return True, ""
+        # On unexpected errors, skip linting to not block workflow
+        pass
+
+
+def check_pending_lint() -> str | None:
+    """Reap a finished background lint; return its error output, if any."""
+    try:
+        pending = json.loads(PENDING_FILE.read_text())
+    except (IOError, json.JSONDecodeError):
+        return None
+
+    jobs = pending.get("jobs")
+    if jobs is None:
+        # Record from before sharding: a single pid/output pair
+        jobs = [{"pid": pending.get("pid"), "output": pending.get("output")}]
+
+    for job in jobs:
+        try:
+            os.kill(job.get("pid"), 0)
+        except (ProcessLookupError, TypeError):
+            continue
+        except PermissionError:
+            pass
+        # At least one shard still running; give up on a lint that never
+        # finishes rather than re-checking forever
+        if time.time() - pending.get("ts", 0) > PENDING_MAX_AGE_SECONDS:
+            PENDING_FILE.unlink(missing_ok=True)
+        return None
+
+    PENDING_FILE.unlink(missing_ok=True)
+
+    # --format=json emits a diagnostics array per shard; merge them
+    diagnostics = []
+    for job in jobs:
+        output_path = job.get("output")
+        if not output_path:
+            continue
+        try:
+            output = Path(output_path).read_text().strip()
+            Path(output_path).unlink(missing_ok=True)
+        except IOError:
+            continue
+        try:
+            data = json.loads(output)
+        except json.JSONDecodeError:
+            continue
+        shard = data.get("diagnostics", data) if isinstance(data, dict) else data
+        if isinstance(shard, list):
+            diagnostics.extend(shard)
+
+    if diagnostics:
+        return json.dumps({"diagnostics": diagnostics})
+
+    return None
 
 
 def extract_errors(output: str, file_path: str) -> str:
@@ -80,6 +348,24 @@ def extract_errors(output: str, file_path: str) -> str:
     if not output:
         return "Lint errors found"
 
+    # --format=json gives structured diagnostics; fall back to line-scanning
+    # for plain-text output (e.g. the pnpm exec fallback printing its own noise)
+    try:
+        data = json.loads(output)
+        diagnostics = data.get("diagnostics", data) if isinstance(data, dict) else data
+        if isinstance(diagnostics, list):
+            messages = []
+            for diag in diagnostics[:10]:
+                if isinstance(diag, dict):
+                    filename = diag.get("filename", "")
+                    message = diag.get("message", "")
+                    if message:
+                        messages.append(f"{filename}: {message}" if filename else message)
+            if messages:
+                return "\n".join(messages)
+    except json.JSONDecodeError:
+        pass
+
     lines = output.split("\n")
     relevant_lines = []
 
@@ -98,44 +384,57 @@ def extract_errors(output: str, file_path: str) -> str:
     return output[:500]  # Fallback to truncated output
 
 
-def main():
-    # Read input from stdin
-    try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
-        print(json.dumps({"decision": "allow"}))
-        return
-
+def check(input_data: dict) -> dict:
+    """Run the oxlint check and return the decision dict."""
     # Extract file path from tool input
     tool_input = input_data.get("tool_input", {})
     file_path = tool_input.get("file_path", "")
 
     if not file_path:
-        print(json.dumps({"decision": "allow"}))
-        return
+        return {"decision": "allow"}
+
+    lintable = is_lintable_file(file_path)
+    project_root = find_project_root(file_path) if lintable else None
+
+    # Surface errors from the previous background lint before anything else.
+    # The edit that fired this hook still needs linting, so it goes on the
+    # queue first - blocking must not let it escape coverage
+    previous_errors = check_pending_lint()
+    if previous_errors:
+        if project_root:
+            queue_file(project_root, str(Path(file_path).resolve()))
+        errors = extract_errors(previous_errors, file_path)
+        return {
+            "decision": "block",
+            "reason": f"Lint errors found! Fix before continuing:\n\n{errors}"
+        }
 
-    # Check if file should be linted
-    if not is_lintable_file(file_path):
-        print(json.dumps({"decision": "allow"}))
-        return
+    if not lintable or not project_root:
+        return {"decision": "allow"}
 
-    # Find project root
-    project_root = find_project_root(file_path)
-    if not project_root:
-        print(json.dumps({"decision": "allow"}))
-        return
+    # Queue the file, wait out the debounce window, then lint the whole
+    # batch in one detached oxlint process. If a concurrent hook instance
+    # already claimed the queue (it swept our file into its batch), or the
+    # lint runs in the background, allow immediately either way.
+    queue_file(project_root, str(Path(file_path).resolve()))
+    time.sleep(DEBOUNCE_SECONDS)
 
-    # Run oxlint
-    success, output = run_oxlint(file_path, project_root)
+    pending = drain_queue(project_root)
+    if pending:
+        start_background_lint(pending, project_root)
 
-    if success:
+    return {"decision": "allow"}
+
+
+def main():
+    # Read input from stdin
+    try:
+        input_data = json_loads(sys.stdin.buffer.read())
+    except ValueError:
         print(json.dumps({"decision": "allow"}))
-    else:
-        errors = extract_errors(output, file_path)
-        print(json.dumps({
-            "decision": "block",
-            "reason": f"Lint errors found! Fix before continuing:\n\n{errors}"
-        }))
+        return
+
+    print(json.dumps(check(input_data)))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Fused PostToolUse Validator
+
+Runs the oxlint, storybook, and test-methodology checks in a single
+Python process instead of spawning one interpreter per validator.
+Stdin is parsed once and each check sees the same input; a block
+short-circuits, and allow-with-reason warnings are combined.
+
+Usage: python3 ~/.claude/hooks/validators/post_tool_use.py
+Input: JSON on stdin with tool_input.file_path
+Output: JSON with decision (allow/block) and reason
+"""
+
+import json
+import sys
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+import oxlint_validator
+import storybook_validator
+import test_methodology_validator
+
+CHECKS = [
+    oxlint_validator.check,
+    storybook_validator.check,
+    test_methodology_validator.check,
+]
+
+
+def run_checks(input_data: dict) -> dict:
+    """Run all validator checks, short-circuiting on the first block."""
+    reasons = []
+
+    for validator_check in CHECKS:
+        try:
+            result = validator_check(input_data)
+        except Exception:
+            # A broken validator shouldn't block the workflow
+            continue
+
+        if result.get("decision") == "block":
+            return result
+        if result.get("reason"):
+            reasons.append(result["reason"])
+
+    if reasons:
+        return {"decision": "allow", "reason": "\n\n".join(reasons)}
+
+    return {"decision": "allow"}
+
+
+def main():
+    # Read input from stdin
+    try:
+        input_data = json_loads(sys.stdin.buffer.read())
+    except ValueError:
+        print(json.dumps({"decision": "allow"}))
+        return
+
+    print(json.dumps(run_checks(input_data)))
+
+
+if __name__ == "__main__":
+    main()
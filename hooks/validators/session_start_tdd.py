@@ -10,22 +10,26 @@ Usage: uv run ~/.claude/hooks/validators/session_start_tdd.py
 """
 
 import json
+import sqlite3
 from pathlib import Path
 
-STATE_FILE = Path.home() / ".claude" / "data" / "tdd_session_state.json"
+DB_FILE = Path.home() / ".claude" / "data" / "tdd_session_state.sqlite"
 
 
 def main():
     """Reset the TDD session state."""
-    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-
-    initial_state = {
-        "test_files_modified": [],
-        "session_id": None,
-        "started_at": None
-    }
-
-    STATE_FILE.write_text(json.dumps(initial_state, indent=2))
+    DB_FILE.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(DB_FILE, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS test_files ("
+        "path TEXT PRIMARY KEY, lower_name TEXT, added_at INTEGER)"
+    )
+    # Skip the write transaction when the state is already empty
+    if conn.execute("SELECT 1 FROM test_files LIMIT 1").fetchone():
+        conn.execute("DELETE FROM test_files")
+    conn.close()
 
     # Output confirmation (hooks expect JSON or empty output)
     print(json.dumps({"status": "reset", "message": "TDD session state cleared"}))
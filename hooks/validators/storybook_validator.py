@@ -10,46 +10,63 @@ Input: JSON on stdin with tool_input.file_path
 Output: JSON with decision (allow/block) and reason
 """
 
+import functools
 import json
+import os
 import sys
 from pathlib import Path
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
+@functools.lru_cache(maxsize=None)
+def _dir_entries(dir_path: str) -> frozenset[str]:
+    """Names in a directory, cached so candidate probes share one listing."""
+    try:
+        return frozenset(os.listdir(dir_path))
+    except OSError:
+        return frozenset()
+
+
+
+# Test files, stories, and index files
+_SKIP_NAME_PATTERNS = (".test.", ".spec.", ".stories.", "index.", "types.", ".d.")
+
+# Non-component directories
+_SKIP_DIRS = frozenset({"hooks", "utils", "lib", "types", "api", "services", "providers"})
+
+# Likely a component if in components, atoms, molecules, organisms, features
+_COMPONENT_DIRS = frozenset({"components", "atoms", "molecules", "organisms", "features", "ui"})
+
+
+@functools.lru_cache(maxsize=1024)
 def is_component_file(file_path: str) -> bool:
     """Check if a file is a React component file."""
-    path = Path(file_path)
+    # Pure string checks - building a Path here costs more than the decision
+    stem, ext = os.path.splitext(os.path.basename(file_path))
 
     # Must be TSX/JSX
-    if path.suffix not in {".tsx", ".jsx"}:
+    if ext not in {".tsx", ".jsx"}:
         return False
 
-    name = path.name.lower()
-
-    # Skip test files, stories, and index files
-    skip_patterns = [
-        ".test.", ".spec.", ".stories.",
-        "index.", "types.", ".d."
-    ]
-    if any(pattern in name for pattern in skip_patterns):
+    name = (stem + ext).lower()
+    if any(pattern in name for pattern in _SKIP_NAME_PATTERNS):
         return False
 
-    # Skip non-component directories
-    skip_dirs = ["hooks", "utils", "lib", "types", "api", "services", "providers"]
-    if any(d in path.parts for d in skip_dirs):
+    parts = file_path.replace("\\", "/").split("/")
+    if any(d in _SKIP_DIRS for d in parts):
         return False
 
-    # Likely a component if in components, atoms, molecules, organisms, features
-    component_dirs = ["components", "atoms", "molecules", "organisms", "features", "ui"]
-    if any(d in path.parts for d in component_dirs):
+    if any(d in _COMPONENT_DIRS for d in parts):
         return True
 
     # Check if file starts with uppercase (PascalCase component)
-    if path.stem[0].isupper():
-        return True
-
-    return False
+    return bool(stem) and stem[0].isupper()
 
 
+@functools.lru_cache(maxsize=1024)
 def find_story_file(component_path: str) -> Path | None:
     """Find the corresponding story file for a component."""
     path = Path(component_path)
@@ -67,49 +84,51 @@ def find_story_file(component_path: str) -> Path | None:
     ]
 
     for story_path in story_patterns:
-        if story_path.exists():
+        if story_path.name in _dir_entries(str(story_path.parent)):
             return story_path
 
     return None
 
 
-def main():
-    # Read input from stdin
-    try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
-        print(json.dumps({"decision": "allow"}))
-        return
-
+def check(input_data: dict) -> dict:
+    """Run the Storybook story check and return the decision dict."""
     # Extract file path from tool input
     tool_input = input_data.get("tool_input", {})
     file_path = tool_input.get("file_path", "")
 
     if not file_path:
-        print(json.dumps({"decision": "allow"}))
-        return
+        return {"decision": "allow"}
 
     # Check if this is a component file
     if not is_component_file(file_path):
-        print(json.dumps({"decision": "allow"}))
-        return
+        return {"decision": "allow"}
 
     # Check if story file exists
     story_file = find_story_file(file_path)
 
     if story_file:
-        print(json.dumps({"decision": "allow"}))
-        return
+        return {"decision": "allow"}
 
     # No story file found - provide guidance but allow (soft warning)
     # Change to "block" for strict enforcement
     path = Path(file_path)
     suggested_story = path.parent / f"{path.stem}.stories.tsx"
 
-    print(json.dumps({
+    return {
         "decision": "allow",  # Change to "block" for strict mode
         "reason": f"UI Component without Storybook story.\n\nConsider creating: {suggested_story}\n\nStories help document component variants and enable visual testing."
-    }))
+    }
+
+
+def main():
+    # Read input from stdin
+    try:
+        input_data = json_loads(sys.stdin.buffer.read())
+    except ValueError:
+        print(json.dumps({"decision": "allow"}))
+        return
+
+    print(json.dumps(check(input_data)))
 
 
 if __name__ == "__main__":
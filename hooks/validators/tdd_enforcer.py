@@ -11,72 +11,115 @@ Input: JSON on stdin with tool_input.file_path
 Output: JSON with decision (allow/block) and reason
 """
 
+import functools
 import json
+import os
+import sqlite3
 import sys
+import time
 from pathlib import Path
 
-STATE_FILE = Path.home() / ".claude" / "data" / "tdd_session_state.json"
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
+DB_FILE = Path.home() / ".claude" / "data" / "tdd_session_state.sqlite"
 
-def load_state() -> dict:
-    """Load the current session state."""
-    if STATE_FILE.exists():
-        try:
-            return json.loads(STATE_FILE.read_text())
-        except (json.JSONDecodeError, IOError):
-            return {"test_files_modified": [], "session_id": None}
-    return {"test_files_modified": [], "session_id": None}
 
+def open_db() -> sqlite3.Connection:
+    """Open the session-state database, creating the schema on first use.
 
-def save_state(state: dict) -> None:
-    """Save the session state."""
-    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    STATE_FILE.write_text(json.dumps(state, indent=2))
+    WAL mode makes single-row appends O(1) and safe under the concurrent
+    hook processes that parallel tool calls produce, without rewriting the
+    whole state on every hook like the old JSON file did.
+    """
+    DB_FILE.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(DB_FILE, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS test_files ("
+        "path TEXT PRIMARY KEY, lower_name TEXT, added_at INTEGER)"
+    )
+    return conn
 
 
-def is_test_file(file_path: str) -> bool:
-    """Check if a file is a test file."""
-    path = Path(file_path)
-    name = path.name.lower()
+def record_test_file(conn: sqlite3.Connection, normalized_path: str) -> None:
+    """Record a modified test file; repeated inserts are idempotent.
+
+    Checks before inserting so repeated edits to the same test (the common
+    case during an editing burst) don't pay a write transaction.
+    """
+    if conn.execute(
+        "SELECT 1 FROM test_files WHERE path = ?", (normalized_path,)
+    ).fetchone():
+        return
+
+    conn.execute(
+        "INSERT OR IGNORE INTO test_files (path, lower_name, added_at) VALUES (?, ?, ?)",
+        (normalized_path, Path(normalized_path).name.lower(), int(time.time())),
+    )
 
-    # Check common test file patterns
-    test_patterns = [
-        ".test.", ".spec.", "_test.", "_spec.",
-        "test_", "spec_"
-    ]
 
-    # Check if in __tests__ directory
-    if "__tests__" in path.parts:
+def any_test_recorded(conn: sqlite3.Connection, possible_tests: list[str]) -> bool:
+    """Check whether any candidate test file was modified this session."""
+    if not possible_tests:
+        return False
+
+    paths = [normalize_path(p) for p in possible_tests]
+    placeholders = ",".join("?" * len(paths))
+    if conn.execute(
+        f"SELECT 1 FROM test_files WHERE path IN ({placeholders})", paths
+    ).fetchone():
         return True
 
-    # Check if in tests/ directory at any level
-    if "tests" in path.parts:
+    # Case-insensitive basename fallback, matching the old list scan
+    names = [Path(p).name.lower() for p in possible_tests]
+    return conn.execute(
+        f"SELECT 1 FROM test_files WHERE lower_name IN ({placeholders})", names
+    ).fetchone() is not None
+
+
+# Common test file patterns
+_TEST_NAME_PATTERNS = (".test.", ".spec.", "_test.", "_spec.", "test_", "spec_")
+
+
+@functools.lru_cache(maxsize=1024)
+def is_test_file(file_path: str) -> bool:
+    """Check if a file is a test file."""
+    # Pure string checks - building a Path here costs more than the decision
+    parts = file_path.replace("\\", "/").split("/")
+
+    # Check if in __tests__ or tests/ directory at any level
+    if "__tests__" in parts or "tests" in parts:
         return True
 
-    return any(pattern in name for pattern in test_patterns)
+    name = parts[-1].lower()
+    return any(pattern in name for pattern in _TEST_NAME_PATTERNS)
+
+
+_IMPL_EXTENSIONS = frozenset({".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs"})
+
+# Config files are not implementation files
+_CONFIG_NAME_PATTERNS = (
+    "config.", ".config.", "rc.", ".d.ts",
+    "vite.config", "vitest.config", "jest.config",
+    "tsconfig", "eslint", "prettier"
+)
 
 
+@functools.lru_cache(maxsize=1024)
 def is_impl_file(file_path: str) -> bool:
     """Check if a file is an implementation file (TypeScript/JavaScript)."""
-    path = Path(file_path)
-    extensions = {".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs"}
-
-    if path.suffix not in extensions:
+    if os.path.splitext(file_path)[1] not in _IMPL_EXTENSIONS:
         return False
 
     # Not an impl file if it's a test file
     if is_test_file(file_path):
         return False
 
-    # Skip config files
-    config_patterns = [
-        "config.", ".config.", "rc.", ".d.ts",
-        "vite.config", "vitest.config", "jest.config",
-        "tsconfig", "eslint", "prettier"
-    ]
-
-    name = path.name.lower()
-    return not any(pattern in name for pattern in config_patterns)
+    name = os.path.basename(file_path).lower()
+    return not any(pattern in name for pattern in _CONFIG_NAME_PATTERNS)
 
 
 def find_matching_tests(impl_path: str) -> list[str]:
@@ -123,15 +166,19 @@ def find_matching_tests(impl_path: str) -> list[str]:
 
 
 def normalize_path(file_path: str) -> str:
-    """Normalize a file path for comparison."""
-    return str(Path(file_path).resolve())
+    """Normalize a file path for comparison.
+
+    Pure string normalization — resolve() would pay a realpath syscall per
+    candidate, and symlink resolution doesn't matter for path equality here.
+    """
+    return os.path.normpath(os.path.abspath(file_path))
 
 
 def main():
     # Read input from stdin
     try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
+        input_data = json_loads(sys.stdin.buffer.read())
+    except ValueError:
         print(json.dumps({"decision": "allow"}))
         return
 
@@ -143,15 +190,13 @@ def main():
         print(json.dumps({"decision": "allow"}))
         return
 
-    # Load current state
-    state = load_state()
     normalized_path = normalize_path(file_path)
 
     # If it's a test file, record it and allow
     if is_test_file(file_path):
-        if normalized_path not in state["test_files_modified"]:
-            state["test_files_modified"].append(normalized_path)
-            save_state(state)
+        conn = open_db()
+        record_test_file(conn, normalized_path)
+        conn.close()
         print(json.dumps({"decision": "allow"}))
         return
 
@@ -160,21 +205,15 @@ def main():
         print(json.dumps({"decision": "allow"}))
         return
 
-    # It's an implementation file - check if corresponding test exists
+    # It's an implementation file - check if a matching test has been modified
     possible_tests = find_matching_tests(file_path)
-    modified_tests = set(state.get("test_files_modified", []))
-
-    # Check if any matching test has been modified
-    for test_path in possible_tests:
-        normalized_test = normalize_path(test_path)
-        if normalized_test in modified_tests:
-            print(json.dumps({"decision": "allow"}))
-            return
-        # Also check if test file exists and was modified (case-insensitive)
-        for modified in modified_tests:
-            if Path(modified).name.lower() == Path(test_path).name.lower():
-                print(json.dumps({"decision": "allow"}))
-                return
+    conn = open_db()
+    test_found = any_test_recorded(conn, possible_tests)
+    conn.close()
+
+    if test_found:
+        print(json.dumps({"decision": "allow"}))
+        return
 
     # No matching test found - block with helpful message
     suggested_test = possible_tests[0] if possible_tests else f"{file_path.replace('.ts', '.test.ts')}"
@@ -11,54 +11,128 @@ Input: JSON on stdin with tool_input.file_path
 Output: JSON with decision (allow/block) and reason
 """
 
+import functools
 import json
+import os
 import re
 import sys
 from pathlib import Path
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
+@functools.lru_cache(maxsize=None)
+def _dir_entries(dir_path: str) -> frozenset[str]:
+    """Names in a directory, cached so candidate probes share one listing."""
+    try:
+        return frozenset(os.listdir(dir_path))
+    except OSError:
+        return frozenset()
+
+
+
+_COMPONENT_EXTENSIONS = frozenset({".tsx", ".jsx", ".vue"})
+
+# Test files, stories, and index files
+_SKIP_NAME_PATTERNS = (".test.", ".spec.", ".stories.", "index.", "types.")
+
+# Component directories
+_COMPONENT_DIRS = frozenset({"components", "atoms", "molecules", "organisms", "features", "ui"})
+
+
+@functools.lru_cache(maxsize=1024)
 def is_component_file(file_path: str) -> bool:
     """Check if a file is a React/Vue component file."""
-    path = Path(file_path)
-
-    if path.suffix not in {".tsx", ".jsx", ".vue"}:
+    # Pure string checks - building a Path here costs more than the decision
+    if os.path.splitext(file_path)[1] not in _COMPONENT_EXTENSIONS:
         return False
 
-    name = path.name.lower()
-
-    # Skip test files, stories, and index files
-    skip_patterns = [".test.", ".spec.", ".stories.", "index.", "types."]
-    if any(pattern in name for pattern in skip_patterns):
+    parts = file_path.replace("\\", "/").split("/")
+    name = parts[-1].lower()
+    if any(pattern in name for pattern in _SKIP_NAME_PATTERNS):
         return False
 
-    # Component directories
-    component_dirs = ["components", "atoms", "molecules", "organisms", "features", "ui"]
-    return any(d in path.parts for d in component_dirs)
+    return any(d in _COMPONENT_DIRS for d in parts)
 
 
+@functools.lru_cache(maxsize=1024)
 def is_story_file(file_path: str) -> bool:
     """Check if file is a Storybook story file."""
-    return ".stories." in Path(file_path).name.lower()
+    return ".stories." in os.path.basename(file_path).lower()
+
+
+PLAY_CACHE_FILE = Path.home() / ".claude" / "data" / "story_play_cache.json"
+
+# LRU eviction bound for the play-function scan cache
+_PLAY_CACHE_MAX_ENTRIES = 1024
+
+# Play function declarations sit near the top of each export; bound how much
+# of a story file we read and scan so large files stay cheap
+_STORY_HEAD_BYTES = 65536
+
+_PLAY_RE = re.compile(rb"play\s*[:=]\s*(?:async|\()")
+_STORIES_WITH_PLAY_RE = re.compile(
+    rb"export\s+const\s+(\w+).{0,4096}?play\s*:", re.DOTALL
+)
+
+
+def _load_play_cache() -> dict:
+    """Load the persisted play-function scan cache."""
+    try:
+        return json.loads(PLAY_CACHE_FILE.read_text())
+    except (IOError, ValueError):
+        return {}
+
+
+def _save_play_cache(cache: dict) -> None:
+    """Persist the play-function scan cache, evicting the oldest entries."""
+    while len(cache) > _PLAY_CACHE_MAX_ENTRIES:
+        cache.pop(next(iter(cache)))
+    try:
+        PLAY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        PLAY_CACHE_FILE.write_text(json.dumps(cache))
+    except IOError:
+        pass
 
 
 def check_story_has_play_function(story_path: Path) -> tuple[bool, list[str]]:
-    """Check if story file has play functions for interaction testing."""
-    if not story_path.exists():
+    """Check if story file has play functions for interaction testing.
+
+    Scan results are cached on disk keyed by mtime, so editing a component
+    doesn't re-read and re-scan its unchanged story file.
+    """
+    try:
+        mtime_ns = os.stat(story_path).st_mtime_ns
+    except OSError:
         return False, []
 
-    content = story_path.read_text()
+    key = str(story_path)
+    cache = _load_play_cache()
+    entry = cache.get(key)
+    if entry and entry.get("mtime_ns") == mtime_ns:
+        return entry.get("has_play", False), entry.get("stories_with_play", [])
 
-    # Look for play function patterns
-    play_patterns = [
-        r"play:\s*async",
-        r"play:\s*\(",
-        r"play\s*=\s*async",
-    ]
+    with story_path.open("rb") as f:
+        content = f.read(_STORY_HEAD_BYTES)
 
-    has_play = any(re.search(p, content) for p in play_patterns)
+    has_play = _PLAY_RE.search(content) is not None
 
     # Find which stories have play functions
-    stories_with_play = re.findall(r"export\s+const\s+(\w+).*?play:", content, re.DOTALL)
+    stories_with_play = [
+        name.decode("utf-8", "replace")
+        for name in _STORIES_WITH_PLAY_RE.findall(content)
+    ]
+
+    # Re-insert at the end so dict order doubles as LRU order
+    cache.pop(key, None)
+    cache[key] = {
+        "mtime_ns": mtime_ns,
+        "has_play": has_play,
+        "stories_with_play": stories_with_play,
+    }
+    _save_play_cache(cache)
 
     return has_play, stories_with_play
 
@@ -79,7 +153,7 @@ def check_unit_test_exists(component_path: str) -> Path | None:
     ]
 
     for test_path in test_patterns:
-        if test_path.exists():
+        if test_path.name in _dir_entries(str(test_path.parent)):
             return test_path
 
     return None
@@ -98,25 +172,19 @@ def check_story_file_exists(component_path: str) -> Path | None:
     ]
 
     for story_path in story_patterns:
-        if story_path.exists():
+        if story_path.name in _dir_entries(str(story_path.parent)):
             return story_path
 
     return None
 
 
-def main():
-    try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
-        print(json.dumps({"decision": "allow"}))
-        return
-
+def check(input_data: dict) -> dict:
+    """Run the test-methodology check and return the decision dict."""
     tool_input = input_data.get("tool_input", {})
     file_path = tool_input.get("file_path", "")
 
     if not file_path:
-        print(json.dumps({"decision": "allow"}))
-        return
+        return {"decision": "allow"}
 
     path = Path(file_path)
 
@@ -125,7 +193,7 @@ def main():
         if path.exists():
             has_play, stories_with_play = check_story_has_play_function(path)
             if not has_play:
-                print(json.dumps({
+                return {
                     "decision": "allow",  # Warning, not block
                     "reason": f"""Storybook Interaction Tests Missing!
 
@@ -145,11 +213,9 @@ export const ClickInteraction: Story = {{
 
 Stories with play functions test real user interactions in a browser environment.
 This catches issues that unit tests miss."""
-                }))
-                return
+                }
 
-        print(json.dumps({"decision": "allow"}))
-        return
+        return {"decision": "allow"}
 
     # If writing a component file, check test coverage
     if is_component_file(file_path):
@@ -172,7 +238,7 @@ This catches issues that unit tests miss."""
                 issues.append(f"Story file lacks play functions for interaction tests: {story_file}")
 
         if issues:
-            print(json.dumps({
+            return {
                 "decision": "allow",  # Warning, not block
                 "reason": f"""Test Methodology Check:
 
@@ -181,10 +247,19 @@ This catches issues that unit tests miss."""
 Required testing pattern:
 1. Unit tests (.test.tsx) - Rendering, props, variants
 2. Storybook play functions - User interactions, state changes"""
-            }))
-            return
+            }
+
+    return {"decision": "allow"}
+
+
+def main():
+    try:
+        input_data = json_loads(sys.stdin.buffer.read())
+    except ValueError:
+        print(json.dumps({"decision": "allow"}))
+        return
 
-    print(json.dumps({"decision": "allow"}))
+    print(json.dumps(check(input_data)))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+tsc watch daemon manager for the TypeScript validator.
+
+Keeps one detached `tsc --watch --noEmit` process per project root so the
+compiler's parse/bind work is paid once per session instead of on every
+hook invocation. The watcher recompiles when the edited file hits disk;
+hook-side callers poll its log for the "Found N errors" sentinel.
+"""
+
+import hashlib
+import json
+import os
+import re
+import signal
+import subprocess
+import time
+from pathlib import Path
+
+DAEMON_DIR = Path.home() / ".claude" / "data" / "tsc_daemons"
+
+# Kill a daemon that hasn't served a request for this long
+IDLE_TTL_SECONDS = 600
+
+# How long to wait for the watcher to finish a recompile
+RECHECK_TIMEOUT_SECONDS = 30
+
+_SENTINEL_RE = re.compile(r"Found (\d+) errors?")
+
+
+def _record_path(project_root: Path) -> Path:
+    digest = hashlib.blake2b(str(project_root).encode(), digest_size=8).hexdigest()
+    return DAEMON_DIR / f"{digest}.json"
+
+
+def _pid_alive(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+    except (ProcessLookupError, TypeError):
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _reap_idle() -> None:
+    """Terminate daemons that have been idle past the TTL."""
+    try:
+        records = list(DAEMON_DIR.glob("*.json"))
+    except OSError:
+        return
+
+    now = time.time()
+    for record_file in records:
+        try:
+            record = json.loads(record_file.read_text())
+        except (IOError, ValueError):
+            continue
+
+        if now - record.get("last_used", 0) <= IDLE_TTL_SECONDS:
+            continue
+
+        pid = record.get("pid")
+        if pid and _pid_alive(pid):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+        record_file.unlink(missing_ok=True)
+        log = record.get("log")
+        if log:
+            Path(log).unlink(missing_ok=True)
+
+
+def ensure_daemon(project_root: Path, tsc_cmd: list[str]) -> dict | None:
+    """Return the record of a live watch daemon, starting one if needed."""
+    # Reap on every use, not just on spawn, so watchers from finished
+    # sessions don't linger until some new project starts a daemon
+    _reap_idle()
+
+    record_file = _record_path(project_root)
+    try:
+        record = json.loads(record_file.read_text())
+    except (IOError, ValueError):
+        record = None
+
+    if record and _pid_alive(record.get("pid")):
+        record["last_used"] = time.time()
+        try:
+            record_file.write_text(json.dumps(record))
+        except IOError:
+            pass
+        return record
+
+    log_file = record_file.with_suffix(".log")
+    try:
+        DAEMON_DIR.mkdir(parents=True, exist_ok=True)
+        with open(log_file, "wb") as log:
+            proc = subprocess.Popen(
+                tsc_cmd + ["--watch", "--noEmit", "--pretty", "false", "--preserveWatchOutput"],
+                cwd=project_root,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    record = {
+        "pid": proc.pid,
+        "log": str(log_file),
+        "project_root": str(project_root),
+        "started_at": time.time(),
+        "last_used": time.time(),
+    }
+    try:
+        record_file.write_text(json.dumps(record))
+    except IOError:
+        return None
+
+    return record
+
+
+def collect_diagnostics(record: dict) -> tuple[bool, str] | None:
+    """Wait for the watcher's current compile and parse its result.
+
+    Returns (success, error_output), or None if no "Found N errors"
+    sentinel appeared before the timeout (caller should fall back to a
+    one-shot check).
+    """
+    log_file = Path(record.get("log", ""))
+
+    # Brief grace so the watcher can notice the edit that fired this hook
+    time.sleep(0.3)
+
+    deadline = time.time() + RECHECK_TIMEOUT_SECONDS
+    while time.time() < deadline:
+        try:
+            content = log_file.read_text(errors="replace")
+        except IOError:
+            return None
+
+        lines = content.rstrip().splitlines()
+        if lines:
+            match = _SENTINEL_RE.search(lines[-1])
+            if match:
+                if int(match.group(1)) == 0:
+                    return True, ""
+
+                # Return just the latest compilation block
+                block_start = content.rfind("File change detected")
+                block = content[block_start:] if block_start != -1 else content
+                return False, block.strip()
+
+        # A daemon that died at startup (no tsc, broken tsconfig) never
+        # prints the sentinel; don't stall the full window waiting for it
+        if not _pid_alive(record.get("pid")):
+            return None
+
+        time.sleep(0.2)
+
+    return None
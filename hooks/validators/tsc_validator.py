@@ -5,73 +5,511 @@ TypeScript Compiler Validator - PostToolUse Hook
 Runs tsc --noEmit on TypeScript files after Write/Edit operations.
 Blocks the agent if type errors are found, forcing the agent to fix them.
 
-Usage: uv run ~/.claude/hooks/validators/tsc_validator.py
+Usage: python3 ~/.claude/hooks/validators/tsc_validator.py
 Input: JSON on stdin with tool_input.file_path
 Output: JSON with decision (allow/block) and reason
 """
 
 import json
+import os
+import re
+import shutil
 import subprocess
 import sys
+import time
 from pathlib import Path
 
+import hashlib
+import tsc_daemon
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+TSC_PATH_CACHE_FILE = Path.home() / ".claude" / "data" / "tsc_path.json"
+
+RESULTS_DIR = Path.home() / ".claude" / "data" / "tsc_results"
+
+# Ignore background-check results older than this
+RESULT_TTL_SECONDS = 300
+
+
+_TS_EXTENSIONS = frozenset({".ts", ".tsx", ".mts", ".cts"})
+
+# node_modules plus dist/build directories
+_SKIP_DIR_PARTS = frozenset({"node_modules", "dist", "build", ".next", "out"})
+
 
 def is_typescript_file(file_path: str) -> bool:
     """Check if a file is a TypeScript file."""
-    path = Path(file_path)
-    ts_extensions = {".ts", ".tsx", ".mts", ".cts"}
-
-    if path.suffix not in ts_extensions:
+    # Pure string checks - this runs on every PostToolUse regardless of type
+    dot = file_path.rfind(".")
+    if dot == -1 or file_path[dot:] not in _TS_EXTENSIONS:
         return False
 
     # Skip declaration files
-    if path.name.endswith(".d.ts"):
+    if file_path.endswith(".d.ts"):
         return False
 
-    # Skip node_modules
-    if "node_modules" in path.parts:
-        return False
+    # Skip node_modules and dist/build directories
+    return _SKIP_DIR_PARTS.isdisjoint(file_path.replace("\\", "/").split("/"))
 
-    # Skip dist/build directories
-    if any(d in path.parts for d in ["dist", "build", ".next", "out"]):
-        return False
 
-    return True
+ROOT_CACHE_FILE = Path.home() / ".claude" / "data" / "tsc_project_roots.json"
+
+# Directory -> resolved root (None marks directories known to have no root)
+_root_cache: dict[Path, Path | None] = {}
+
+
+def _is_project_root(candidate: Path) -> bool:
+    # tsconfig.json defines the TS project; a package.json-only directory
+    # just means there's nothing for tsc to check
+    try:
+        return (candidate / "tsconfig.json").is_file()
+    except OSError:
+        return False
 
 
 def find_project_root(file_path: str) -> Path | None:
-    """Find the project root by looking for tsconfig.json or package.json."""
+    """Find the project root by looking for tsconfig.json.
+
+    Nearly all edits in a session share one root, so resolved (and
+    known-missing) directories are cached in-process, and positive results
+    persist on disk with revalidation, replacing the per-ancestor stat walk
+    with an O(1) lookup.
+    """
     path = Path(file_path).resolve()
+    parent_dir = path.parent
+
+    if parent_dir in _root_cache:
+        return _root_cache[parent_dir]
+
+    try:
+        disk_cache = json.loads(ROOT_CACHE_FILE.read_text())
+    except (IOError, ValueError):
+        disk_cache = {}
 
+    known = disk_cache.get(str(parent_dir))
+    if known and _is_project_root(Path(known)):
+        _root_cache[parent_dir] = Path(known)
+        return Path(known)
+
+    root = None
+    visited = []
     for parent in [path] + list(path.parents):
-        if (parent / "tsconfig.json").exists():
-            return parent
-        if (parent / "package.json").exists():
-            return parent
+        visited.append(parent)
+        if _is_project_root(parent):
+            root = parent
+            break
+
+    # Every directory walked maps to the result - including None misses,
+    # which short-circuit repeat lookups outside any project
+    for ancestor in visited:
+        _root_cache[ancestor] = root
+
+    if root is not None:
+        try:
+            disk_cache[str(parent_dir)] = str(root)
+            ROOT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            ROOT_CACHE_FILE.write_text(json.dumps(disk_cache))
+        except IOError:
+            pass
+
+    return root
+
+
+# Parsed tsconfig.json per project root
+_tsconfig_cache: dict[Path, dict | None] = {}
+
+TSCONFIG_CACHE_DIR = Path.home() / ".claude" / "data" / "tsc_plans"
+
+# String literals are captured and kept so comment markers inside them
+# (e.g. the /**/ in "src/**/*") survive the strip
+_TSCONFIG_COMMENT_RE = re.compile(
+    r'("(?:[^"\\]|\\.)*")|//[^\n]*|/\*.*?\*/', re.DOTALL
+)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+def _parse_tsconfig(text: str) -> dict:
+    try:
+        return json.loads(text)
+    except ValueError:
+        # tsconfig allows comments and trailing commas
+        text = _TSCONFIG_COMMENT_RE.sub(lambda m: m.group(1) or "", text)
+        return json.loads(_TRAILING_COMMA_RE.sub(r"\1", text))
+
+
+def load_tsconfig(project_root: Path) -> dict | None:
+    """Parse the project's tsconfig.json, tolerating JSONC syntax.
+
+    The parsed config persists on disk keyed by mtime, so across the
+    hundreds of hook fires in a session the JSONC parse happens once per
+    tsconfig edit instead of once per invocation.
+    """
+    if project_root in _tsconfig_cache:
+        return _tsconfig_cache[project_root]
+
+    tsconfig_path = project_root / "tsconfig.json"
+    try:
+        mtime_ns = os.stat(tsconfig_path).st_mtime_ns
+    except OSError:
+        _tsconfig_cache[project_root] = None
+        return None
+
+    digest = hashlib.blake2b(str(tsconfig_path).encode(), digest_size=8).hexdigest()
+    plan_file = TSCONFIG_CACHE_DIR / f"{digest}.json"
+    try:
+        plan = json.loads(plan_file.read_text())
+        if plan.get("mtime_ns") == mtime_ns:
+            config = plan.get("config")
+            _tsconfig_cache[project_root] = config
+            return config
+    except (IOError, ValueError):
+        pass
+
+    config = None
+    try:
+        config = _parse_tsconfig(tsconfig_path.read_text())
+    except (IOError, ValueError):
+        pass
+
+    if config is not None:
+        try:
+            TSCONFIG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            plan_file.write_text(json.dumps({"mtime_ns": mtime_ns, "config": config}))
+        except (IOError, TypeError):
+            pass
+
+    _tsconfig_cache[project_root] = config
+    return config
+
+
+def _glob_to_re(pattern: str) -> re.Pattern:
+    """Translate a tsconfig include/exclude glob to a regex."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    # A bare directory pattern matches everything beneath it
+    return re.compile("".join(out) + r"(?:/.*)?$")
 
-    return None
 
+def file_in_tsconfig(project_root: Path, file_path: str) -> bool:
+    """Check whether the edited file is part of the TS program.
 
-def run_tsc(project_root: Path) -> tuple[bool, str]:
-    """Run tsc --noEmit and return (success, output)."""
+    Files outside the tsconfig's include globs (or matched by exclude)
+    aren't checked by tsc anyway, so running it for them is pure waste.
+    Ambiguity errs toward True so tsc stays the source of truth.
+    """
+    config = load_tsconfig(project_root)
+    if config is None:
+        return True
+
+    try:
+        rel = str(Path(file_path).resolve().relative_to(project_root)).replace("\\", "/")
+    except ValueError:
+        return True
+
+    files = config.get("files")
+    if files and any(str(Path(f)).replace("\\", "/").lstrip("./") == rel for f in files):
+        return True
+
+    include = config.get("include")
+    if include is None:
+        included = files is None
+    else:
+        included = any(_glob_to_re(p.lstrip("./")).match(rel) for p in include)
+    if not included:
+        return False
+
+    exclude = config.get("exclude", ["node_modules", "bower_components", "jspm_packages"])
+    return not any(_glob_to_re(p.lstrip("./")).match(rel) for p in exclude)
+
+
+# Resolved tsc command per project root, so the lookup runs once per process
+_tsc_cmd_cache: dict[Path, list[str]] = {}
+
+
+def resolve_tsc_command(project_root: Path) -> list[str]:
+    """Resolve the tsc binary, avoiding the npx shim when possible.
+
+    npx pays package-resolution I/O plus a Node cold start before tsc even
+    runs. Prefer node_modules/.bin from the project root upward, then PATH,
+    and only fall back to npx. The resolved path also persists on disk so
+    later hook invocations skip the walk.
+    """
+    cached = _tsc_cmd_cache.get(project_root)
+    if cached is not None:
+        return cached
+
+    cmd = None
+
+    try:
+        disk_cache = json.loads(TSC_PATH_CACHE_FILE.read_text())
+    except (IOError, ValueError):
+        disk_cache = {}
+
+    known = disk_cache.get(str(project_root))
+    if known and Path(known).is_file():
+        cmd = [known]
+
+    if cmd is None:
+        for parent in [project_root] + list(project_root.parents):
+            candidate = parent / "node_modules" / ".bin" / "tsc"
+            if candidate.is_file():
+                cmd = [str(candidate)]
+                break
+
+        if cmd is None:
+            which_tsc = shutil.which("tsc")
+            if which_tsc:
+                cmd = [which_tsc]
+
+        if cmd is not None:
+            try:
+                disk_cache[str(project_root)] = cmd[0]
+                TSC_PATH_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                TSC_PATH_CACHE_FILE.write_text(json.dumps(disk_cache))
+            except IOError:
+                pass
+
+    if cmd is None:
+        cmd = ["npx", "tsc"]
+
+    _tsc_cmd_cache[project_root] = cmd
+    return cmd
+
+
+# Whether the project's TypeScript supports --incremental with --noEmit
+_ts_incremental_cache: dict[Path, bool] = {}
+
+
+def supports_incremental(project_root: Path) -> bool:
+    """Check for TypeScript >= 4.0, which allows --incremental --noEmit."""
+    cached = _ts_incremental_cache.get(project_root)
+    if cached is not None:
+        return cached
+
+    # Assume a modern TypeScript when the version can't be determined
+    supported = True
+    try:
+        pkg = json.loads(
+            (project_root / "node_modules" / "typescript" / "package.json").read_text()
+        )
+        supported = int(str(pkg.get("version", "4")).split(".")[0]) >= 4
+    except (IOError, ValueError):
+        pass
+
+    _ts_incremental_cache[project_root] = supported
+    return supported
+
+
+def tsc_args(project_root: Path) -> list[str]:
+    """Build the tsc argument list, enabling the incremental cache.
+
+    With --incremental and a persistent .tsbuildinfo, repeat checks skip
+    unchanged files instead of paying a full cold type-check per hook.
+    """
+    args = ["--noEmit"]
+
+    if supports_incremental(project_root):
+        buildinfo = project_root / "node_modules" / ".cache" / "clawd" / "tsc.tsbuildinfo"
+        try:
+            buildinfo.parent.mkdir(parents=True, exist_ok=True)
+            args += ["--incremental", "--tsBuildInfoFile", str(buildinfo)]
+        except OSError:
+            pass
+
+    return args
+
+
+def write_single_file_tsconfig(project_root: Path, file_paths: list[str]) -> Path | None:
+    """Synthesize a tsconfig that checks only the edited files.
+
+    Extends the project config so compiler options carry over while check
+    time scales with the edit batch instead of the whole program. Returns
+    None when the project has no tsconfig.json to extend.
+    """
+    project_tsconfig = project_root / "tsconfig.json"
+    if not project_tsconfig.exists():
+        return None
+
+    cache_dir = project_root / "node_modules" / ".cache" / "clawd"
+    single_config = cache_dir / "tsconfig.single.json"
     try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        single_config.write_text(json.dumps({
+            "extends": str(project_tsconfig),
+            "files": [str(Path(p).resolve()) for p in file_paths],
+            "include": [],
+            "compilerOptions": {
+                "noEmit": True,
+                "incremental": True,
+                "tsBuildInfoFile": str(cache_dir / "tsc.single.tsbuildinfo"),
+            },
+        }))
+    except IOError:
+        return None
+
+    return single_config
+
+
+# Plain output means no ANSI escapes for extract_errors to trip over
+_TSC_ENV = {**os.environ, "NO_COLOR": "1", "FORCE_COLOR": "0"}
+
+TIMINGS_FILE = Path.home() / ".claude" / "data" / "tsc_timings.json"
+
+# Budget for a project we've never timed
+DEFAULT_TIMEOUT_SECONDS = 60.0
+
+# Smoothing factor for the wall-clock EWMA
+_EWMA_ALPHA = 0.3
+
+
+def _load_timings() -> dict:
+    try:
+        return json.loads(TIMINGS_FILE.read_text())
+    except (IOError, ValueError):
+        return {}
+
+
+def _save_timings(timings: dict) -> None:
+    try:
+        TIMINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        TIMINGS_FILE.write_text(json.dumps(timings))
+    except IOError:
+        pass
+
+
+def check_timeout(project_root: Path, mode: str) -> float:
+    """Timeout budget sized from this project's prior tsc wall-clock.
+
+    A flat 60s over-reserves on small projects (where a hung tsc stalls
+    the hook that long before allowing) and can silently truncate on big
+    monorepos. Three times the smoothed prior runtime, floored at 5s,
+    tracks what the project actually needs. Timings are tracked per mode
+    ("single" vs "full") - a history of fast single-file checks must not
+    starve the full-program fallback's budget.
+    """
+    ewma_ms = _load_timings().get(f"{project_root}|{mode}")
+    if not ewma_ms:
+        return DEFAULT_TIMEOUT_SECONDS
+    return max(5.0, 3.0 * ewma_ms / 1000)
+
+
+def record_duration(project_root: Path, mode: str, elapsed_ms: float) -> None:
+    """Fold a completed run's wall-clock into the project/mode EWMA."""
+    timings = _load_timings()
+    key = f"{project_root}|{mode}"
+    old = timings.get(key)
+    timings[key] = (
+        elapsed_ms if old is None else _EWMA_ALPHA * elapsed_ms + (1 - _EWMA_ALPHA) * old
+    )
+    _save_timings(timings)
+
+
+def record_timeout(project_root: Path, mode: str) -> None:
+    """Double the stored estimate so the next run gets more budget."""
+    timings = _load_timings()
+    key = f"{project_root}|{mode}"
+    old = timings.get(key)
+    if old:
+        timings[key] = old * 2
+        _save_timings(timings)
+
+
+def _decode_output(result: subprocess.CompletedProcess) -> str:
+    """Decode captured stdout+stderr in one pass.
+
+    Capturing bytes and decoding once is cheaper than the TextIOWrapper
+    machinery text=True sets up, which matters for large error dumps.
+    """
+    return (result.stdout + result.stderr).decode("utf-8", "replace").strip()
+
+
+def run_tsc(project_root: Path, file_paths: list[str]) -> tuple[bool, str]:
+    """Type-check the edited files and return (success, output).
+
+    The fast path checks only the edited files via a synthesized tsconfig;
+    when they come back clean, the persistent `tsc --watch` daemon's
+    diagnostics are consulted so cross-file breakage caused by the edit
+    still surfaces. Without a project tsconfig to synthesize from, falls
+    back to waiting on the daemon, then to a one-shot full check.
+    """
+    record = tsc_daemon.ensure_daemon(project_root, resolve_tsc_command(project_root))
+
+    single_config = write_single_file_tsconfig(project_root, file_paths)
+    if single_config is not None:
+        try:
+            started = time.monotonic()
+            result = subprocess.run(
+                resolve_tsc_command(project_root) + ["-p", str(single_config)],
+                cwd=project_root,
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                env=_TSC_ENV,
+                timeout=check_timeout(project_root, "single")
+            )
+            record_duration(project_root, "single", (time.monotonic() - started) * 1000)
+
+            if result.returncode != 0:
+                return False, _decode_output(result)
+
+            # The edited files are clean; ask the full-project watcher
+            # whether the edit broke anything elsewhere
+            if record:
+                daemon_result = tsc_daemon.collect_diagnostics(record)
+                if daemon_result is not None:
+                    return daemon_result
+            return True, ""
+
+        except subprocess.TimeoutExpired:
+            record_timeout(project_root, "single")
+            return True, ""  # Allow on timeout
+        except FileNotFoundError:
+            return True, ""
+        except Exception:
+            return True, ""
+
+    if record:
+        result = tsc_daemon.collect_diagnostics(record)
+        if result is not None:
+            return result
+
+    try:
+        started = time.monotonic()
         result = subprocess.run(
-            ["npx", "tsc", "--noEmit"],
+            resolve_tsc_command(project_root) + tsc_args(project_root),
             cwd=project_root,
+            stdin=subprocess.DEVNULL,
             capture_output=True,
-            text=True,
-            timeout=60
+            env=_TSC_ENV,
+            timeout=check_timeout(project_root, "full")
         )
+        record_duration(project_root, "full", (time.monotonic() - started) * 1000)
 
         # tsc returns 0 on success, non-zero on errors
         if result.returncode == 0:
             return True, ""
 
         # Combine stdout and stderr for error output
-        output = result.stdout + result.stderr
-        return False, output.strip()
+        return False, _decode_output(result)
 
     except subprocess.TimeoutExpired:
+        record_timeout(project_root, "full")
         return True, ""  # Allow on timeout
     except FileNotFoundError:
         # tsc not installed - allow
@@ -81,42 +519,276 @@ def run_tsc(project_root: Path) -> tuple[bool, str]:
         return True, ""
 
 
+def _result_path(project_root: Path) -> Path:
+    digest = hashlib.blake2b(str(project_root).encode(), digest_size=8).hexdigest()
+    return RESULTS_DIR / f"{digest}.json"
+
+
+QUEUE_DIR = Path.home() / ".claude" / "data" / "tsc_queues"
+
+# How long to wait for other edits in a burst to land in the queue
+DEBOUNCE_SECONDS = 0.2
+
+
+def _queue_path(project_root: Path) -> Path:
+    digest = hashlib.blake2b(str(project_root).encode(), digest_size=8).hexdigest()
+    return QUEUE_DIR / f"{digest}.jsonl"
+
+
+def queue_edit(project_root: Path, file_path: str) -> None:
+    """Append an edited file to the project's pending-check queue."""
+    try:
+        QUEUE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(_queue_path(project_root), "a") as f:
+            f.write(json.dumps({"file": file_path, "ts": time.time()}) + "\n")
+    except IOError:
+        pass
+
+
+def drain_edit_queue(project_root: Path) -> list[str]:
+    """Atomically claim and drain the queue, returning deduped file paths.
+
+    Uses os.replace so that when several hook instances race, exactly one
+    wins the batch and the rest see an empty queue - a burst of edits pays
+    for one tsc dispatch instead of one per file.
+    """
+    queue = _queue_path(project_root)
+    claimed = queue.with_suffix(".draining")
+    try:
+        os.replace(queue, claimed)
+    except OSError:
+        return []
+
+    files: list[str] = []
+    seen: set[str] = set()
+    try:
+        with open(claimed) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                path = entry.get("file", "")
+                if path and path not in seen:
+                    seen.add(path)
+                    files.append(path)
+    except IOError:
+        pass
+    finally:
+        try:
+            os.unlink(claimed)
+        except OSError:
+            pass
+
+    return files
+
+
+HASH_CACHE_DIR = Path.home() / ".claude" / "data" / "tsc_file_hashes"
+
+
+def _hash_cache_path(project_root: Path) -> Path:
+    digest = hashlib.blake2b(str(project_root).encode(), digest_size=8).hexdigest()
+    return HASH_CACHE_DIR / f"{digest}.json"
+
+
+def _tree_max_mtime_ns(project_root: Path, exclude: str) -> int:
+    """Max mtime of any TypeScript source in the project except `exclude`.
+
+    Used to invalidate the per-file hash cache when some other file
+    changed - the edited file being byte-identical isn't enough if its
+    dependencies moved under it. The edited file itself is excluded:
+    re-writing it bumps its mtime even when the bytes are identical,
+    which is exactly the case the hash is there to catch.
+    """
+    scan_root = project_root / "src"
+    if not scan_root.is_dir():
+        scan_root = project_root
+
+    max_mtime = 0
+    stack = [str(scan_root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _SKIP_DIR_PARTS:
+                            stack.append(entry.path)
+                    elif (
+                        entry.name[entry.name.rfind("."):] in _TS_EXTENSIONS
+                        and entry.path != exclude
+                    ):
+                        mtime = entry.stat().st_mtime_ns
+                        if mtime > max_mtime:
+                            max_mtime = mtime
+        except OSError:
+            continue
+
+    return max_mtime
+
+
+def check_unchanged(project_root: Path, file_path: str) -> bool:
+    """True when this exact content already passed and nothing else changed.
+
+    Agents often re-write a file with identical bytes; one BLAKE2b hash is
+    orders of magnitude cheaper than the tsc run it saves.
+    """
+    resolved = str(Path(file_path).resolve())
+    try:
+        data = Path(resolved).read_bytes()
+    except IOError:
+        return False
+
+    file_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+    try:
+        cache = json.loads(_hash_cache_path(project_root).read_text())
+    except (IOError, ValueError):
+        return False
+
+    entry = cache.get(file_path)
+    return (
+        entry is not None
+        and entry.get("file_hash") == file_hash
+        and entry.get("success")
+        and entry.get("tree_mtime_ns") == _tree_max_mtime_ns(project_root, resolved)
+    )
+
+
+def remember_file_hash(project_root: Path, file_path: str, success: bool) -> None:
+    """Record the checked file's content hash for the unchanged short-circuit."""
+    resolved = str(Path(file_path).resolve())
+    try:
+        data = Path(resolved).read_bytes()
+    except IOError:
+        return
+
+    cache_file = _hash_cache_path(project_root)
+    try:
+        cache = json.loads(cache_file.read_text())
+    except (IOError, ValueError):
+        cache = {}
+
+    cache[file_path] = {
+        "file_hash": hashlib.blake2b(data, digest_size=16).hexdigest(),
+        "tree_mtime_ns": _tree_max_mtime_ns(project_root, resolved),
+        "success": success,
+    }
+    try:
+        HASH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(cache))
+    except IOError:
+        pass
+
+
+def read_last_result(project_root: Path) -> dict | None:
+    """Read the last background check's result, ignoring stale entries."""
+    try:
+        result = json.loads(_result_path(project_root).read_text())
+    except (IOError, ValueError):
+        return None
+
+    if time.time() - result.get("ts", 0) > RESULT_TTL_SECONDS:
+        return None
+
+    return result
+
+
+def write_last_result(project_root: Path, success: bool, errors: str, file_path: str) -> None:
+    """Atomically persist a background check's result for the next hook."""
+    result_file = _result_path(project_root)
+    try:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = result_file.with_suffix(f".tmp.{os.getpid()}")
+        tmp_file.write_text(json.dumps({
+            "success": success,
+            "errors": errors,
+            "file": file_path,
+            "ts": time.time(),
+        }))
+        os.replace(tmp_file, result_file)
+    except IOError:
+        pass
+
+
+def start_background_check(project_root: Path, file_paths: list[str]) -> None:
+    """Re-exec this script detached to run tsc off the agent's critical path.
+
+    Skips the spawn when a worker for this project is still running so
+    rapid edit bursts don't pile up tsc processes; the drained batch goes
+    back on the queue for that worker to pick up when its current run
+    finishes, rather than being dropped unchecked.
+    """
+    running_marker = _result_path(project_root).with_suffix(".pid")
+    try:
+        pid = int(running_marker.read_text())
+        os.kill(pid, 0)
+        for file_path in file_paths:
+            queue_edit(project_root, file_path)
+        return
+    except (IOError, ValueError, ProcessLookupError, PermissionError):
+        pass
+
+    try:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--worker", str(project_root)] + file_paths,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        running_marker.write_text(str(proc.pid))
+    except Exception:
+        pass
+
+
+def background_worker(project_root: Path, file_paths: list[str]) -> None:
+    """Detached entry point: run the check and persist its result.
+
+    Loops over batches re-queued while this worker was busy, so edits
+    that arrived mid-run still get checked.
+    """
+    while file_paths:
+        success, output = run_tsc(project_root, file_paths)
+        write_last_result(project_root, success, output, file_paths[0])
+        for file_path in file_paths:
+            remember_file_hash(project_root, file_path, success)
+        file_paths = drain_edit_queue(project_root)
+    try:
+        _result_path(project_root).with_suffix(".pid").unlink()
+    except OSError:
+        pass
+
+
+# tsc error lines: "path/to/file.ts(12,5): error TS2304: message"
+_TSC_ERROR_RE = re.compile(r"^(.+?)\((\d+),(\d+)\): error (TS\d+): (.+)$", re.M)
+
+
 def extract_errors(output: str, file_path: str) -> str:
     """Extract relevant error messages from tsc output."""
     if not output:
         return "Type errors found"
 
-    lines = output.split("\n")
-    relevant_lines = []
+    # One C-level regex sweep instead of a Python loop over every line
+    matches = _TSC_ERROR_RE.findall(output)
     file_name = Path(file_path).name
 
-    # Try to find errors related to the specific file first
-    in_relevant_error = False
-    for line in lines:
-        if file_name in line or file_path in line:
-            relevant_lines.append(line)
-            in_relevant_error = True
-        elif in_relevant_error and (line.startswith(" ") or line.strip() == ""):
-            relevant_lines.append(line)
-        else:
-            in_relevant_error = False
-
-    # If no file-specific errors, return first few errors
-    if not relevant_lines:
-        error_lines = [line for line in lines if "error TS" in line]
-        relevant_lines = error_lines[:5]
+    relevant = [m for m in matches if m[0].endswith(file_name)][:10]
+    if not relevant:
+        relevant = matches[:5]
 
-    if relevant_lines:
-        return "\n".join(relevant_lines[:10])  # Limit to 10 lines
+    if relevant:
+        return "\n".join(
+            f"{path}({line},{col}): error {code}: {message}"
+            for path, line, col, code, message in relevant
+        )
 
     return output[:500]  # Fallback to truncated output
 
 
 def main():
-    # Read input from stdin
+    # Read input from stdin as bytes, skipping the TextIOWrapper
     try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
+        input_data = json_loads(sys.stdin.buffer.read())
+    except ValueError:
         print(json.dumps({"decision": "allow"}))
         return
 
@@ -139,13 +811,33 @@ def main():
         print(json.dumps({"decision": "allow"}))
         return
 
-    # Run tsc
-    success, output = run_tsc(project_root)
+    # Files outside the TS program's include globs never produce diagnostics
+    if not file_in_tsconfig(project_root, file_path):
+        print(json.dumps({"decision": "allow"}))
+        return
 
-    if success:
+    # Identical content that already passed needs no new check
+    if check_unchanged(project_root, file_path):
+        print(json.dumps({"decision": "allow"}))
+        return
+
+    # Queue the edit, wait out the debounce window, then dispatch the whole
+    # batch in one worker. If a concurrent hook instance already claimed
+    # the queue (it swept our file into its batch), skip the dispatch.
+    queue_edit(project_root, str(Path(file_path).resolve()))
+    time.sleep(DEBOUNCE_SECONDS)
+    batch = drain_edit_queue(project_root)
+
+    # Answer from the last background check and refresh it off the critical
+    # path; the result of this edit's check lands for the next hook fire
+    last = read_last_result(project_root)
+    if batch:
+        start_background_check(project_root, batch)
+
+    if last is None or last.get("success", True):
         print(json.dumps({"decision": "allow"}))
     else:
-        errors = extract_errors(output, file_path)
+        errors = extract_errors(last.get("errors", ""), file_path)
         print(json.dumps({
             "decision": "block",
             "reason": f"Type errors found! Fix before continuing:\n\n{errors}"
@@ -153,4 +845,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) >= 4 and sys.argv[1] == "--worker":
+        background_worker(Path(sys.argv[2]), sys.argv[3:])
+    else:
+        main()